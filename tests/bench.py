@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# benchmarks for xdb ingestion, query and rendering paths. runs offline against sqlite.
+#
+#   python tests/bench.py --sizes 10000,1000000 --save baseline.json
+#   python tests/bench.py --sizes 10000,1000000 --compare baseline.json
+
+import argparse
+import os
+import sys
+import json
+import time
+import random
+import subprocess
+import tempfile
+
+# output flags measured on the buffered (xtable) path and on the streaming path
+FORMATS = {
+    "table"    : [],
+    "csv"      : ["--csv"],
+    "json"     : ["--json"],
+    "yaml"     : ["--yaml"],
+    "markdown" : ["--markdown"],
+    "pivot"    : ["--pivot"],
+    "wrap"     : ["--wrap"],
+}
+STREAM_FORMATS = {
+    "stream-csv"      : ["--csv","--stream"],
+    "stream-jsonl"    : ["--jsonl"],
+    "stream-markdown" : ["--markdown","--stream"],
+}
+
+
+KINDS = ["int","float","text","wide","date","null"]
+
+def csv_header(cols) :
+    return ["c{}_{}".format(ix,KINDS[ix % len(KINDS)]) for ix in range(cols)]
+
+def gen_csv(path, rows, cols=8, textwidth=32, seed=42) :
+    """ synthetic CSV of mixed types: int, float, text, wide text, date and a
+        sparse nullable column, repeating over cols columns """
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz "
+    header = csv_header(cols)
+    with open(path,"w") as f :
+        f.write(",".join(header)+"\n")
+        for r in range(rows) :
+            vals = []
+            for ix in range(cols) :
+                kind = KINDS[ix % len(KINDS)]
+                if kind == "int" :
+                    vals.append(str(rnd.randint(-10**9,10**9)))
+                elif kind == "float" :
+                    vals.append(repr(rnd.random()*1000))
+                elif kind == "text" :
+                    vals.append("t{}".format(rnd.randint(0,10**6)))
+                elif kind == "wide" :
+                    vals.append('"'+"".join(rnd.choice(letters) for _ in range(textwidth))+'"')
+                elif kind == "date" :
+                    vals.append("20{:02d}-{:02d}-{:02d}".format(rnd.randint(0,30),rnd.randint(1,12),rnd.randint(1,28)))
+                else :
+                    vals.append("" if rnd.random() < 0.9 else str(r))
+            f.write(",".join(vals)+"\n")
+    return header
+
+
+def run(argv, timeout=None) :
+    """ run xdb in a child process. returns wall seconds, peak RSS in MB and exit code """
+    cmd = [sys.executable,"-m","xdb"] + argv
+    t0 = time.perf_counter()
+    errf = tempfile.TemporaryFile()
+    p = subprocess.Popen(cmd,stdin=subprocess.DEVNULL,stdout=subprocess.DEVNULL,stderr=errf)
+    deadline = t0 + timeout if timeout else None
+    while True :
+        pid, status, usage = os.wait4(p.pid,os.WNOHANG)
+        if pid :
+            break
+        if deadline and time.perf_counter() > deadline :
+            p.kill()
+            pid, status, usage = os.wait4(p.pid,0)
+            errf.close()
+            return time.perf_counter() - t0, usage.ru_maxrss / 1024, "timeout"
+        time.sleep(0.005)
+    wall = time.perf_counter() - t0
+    p.returncode = os.waitstatus_to_exitcode(status)
+    errf.seek(0)
+    err = errf.read().decode(errors="replace")
+    errf.close()
+    if p.returncode != 0 or "Traceback" in err :
+        sys.stderr.write(err)
+    # ru_maxrss is in KB on linux
+    return wall, usage.ru_maxrss / 1024, p.returncode
+
+
+def scenarios(csv, db, header, formats) :
+    """ (name, xdb arguments) of every measured path """
+    yield "ingest-memory", ["-t","t="+csv,"-q","select count(*) from t"]
+    yield "ingest-file", ["-c","-d",db+".ingest","-t","t="+csv,"-q","select count(*) from t"]
+    yield "fetch-file", ["-d",db,"-q","select * from t","--jsonl"]
+    yield "fetch-memory", ["-t","t="+csv,"-q","select * from t","--jsonl"]
+    yield "filter-pushdown", ["-d",db,"-q","select * from t","--filter",header[1],"--jsonl"]
+    # a duplicated column keeps the filter from being pushed down
+    yield "filter-client", ["-d",db,"-q","select {}, * from t".format(header[0]),"--filter",header[1],"--jsonl"]
+    for name in formats :
+        yield "render-"+name, ["-d",db,"-q","select * from t"] + dict(FORMATS,**STREAM_FORMATS)[name]
+
+
+def main() :
+    parser = argparse.ArgumentParser(description="xdb benchmarks over synthetic CSV files and sqlite.")
+    parser.add_argument( "--sizes", dest="sizes", default="10000,1000000,10000000", help="comma separated row counts. default 10k,1M,10M.")
+    parser.add_argument( "--cols", dest="cols", type=int, default=8, help="columns per CSV. default 8.")
+    parser.add_argument( "--textwidth", dest="textwidth", type=int, default=32, help="characters in wide text columns. default 32.")
+    parser.add_argument( "--formats", dest="formats", default=",".join(list(FORMATS)+list(STREAM_FORMATS)), help="output formats to measure.")
+    parser.add_argument( "--only", dest="only", default=None, help="only run scenarios whose name contains this string.")
+    parser.add_argument( "--workdir", dest="workdir", default=os.path.join(tempfile.gettempdir(),"xdb-bench"), help="where generated CSV and sqlite files are kept between runs.")
+    parser.add_argument( "--timeout", dest="timeout", type=float, default=600, help="seconds per scenario. default 600.")
+    parser.add_argument( "--save", dest="save", default=None, help="write results to this JSON file as a baseline.")
+    parser.add_argument( "--compare", dest="compare", default=None, help="compare results with a baseline JSON file.")
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir,exist_ok=True)
+    baseline = {}
+    if args.compare :
+        with open(args.compare,"r") as f :
+            baseline = json.loads(f.read()).get("results",{})
+    formats = [f for f in args.formats.split(",") if f]
+    # caches would hide the work being measured
+    env_cache = tempfile.mkdtemp(prefix="xdb-bench-cache-")
+    os.environ["XDG_CACHE_HOME"] = env_cache
+
+    results = {}
+    print("{:<36} {:>10} {:>10} {:>12} {:>10}".format("scenario","wall(s)","rss(MB)","rows/s","vs base"))
+    for rows in [int(n) for n in args.sizes.split(",") if n] :
+        shape = "{}x{}x{}".format(rows,args.cols,args.textwidth)
+        csv = os.path.join(args.workdir,"bench_{}.csv".format(shape))
+        db = os.path.join(args.workdir,"bench_{}.db".format(shape))
+        if not os.path.isfile(csv) :
+            gen_csv(csv,rows,args.cols,args.textwidth)
+        header = csv_header(args.cols)
+        if not os.path.isfile(db) :
+            run(["-c","-d",db,"-t","t="+csv,"-q","select count(*) from t"])
+        if os.path.isfile(db+".ingest") :
+            os.remove(db+".ingest")
+        for name, argv in scenarios(csv,db,header,formats) :
+            if args.only and args.only not in name :
+                continue
+            key = "{}/{}".format(shape,name)
+            wall, rss, rc = run(argv,args.timeout)
+            results[key] = { "wall":round(wall,4), "rss_mb":round(rss,1), "rows":rows, "rc":rc }
+            base = baseline.get(key)
+            ratio = "{:.2f}x".format(wall/base["wall"]) if base and base.get("wall") else ""
+            print("{:<36} {:>10.3f} {:>10.1f} {:>12.0f} {:>10}{}".format(key,wall,rss,rows/wall if wall else 0,ratio,"" if rc == 0 else "  ({})".format(rc)),flush=True)
+
+    if args.save :
+        with open(args.save,"w") as f :
+            f.write(json.dumps({ "time":time.time(), "python":sys.version.split()[0], "results":results },indent=2))
+
+
+if __name__ == "__main__" :
+    main()
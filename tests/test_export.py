@@ -0,0 +1,25 @@
+# -o file export. run with: python -m pytest tests
+
+import pytest
+
+from xdb.xdb import _export
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+def fetched(rows, size=1000) :
+    # batches as run_sql fetches them
+    return [rows[i:i+size] for i in range(0,len(rows),size)]
+
+def test_value_not_fitting_a_later_row_group_fails(tmp_path) :
+    path = tmp_path / "m.parquet"
+    rows = [(i,) for i in range(70000)] + [(1.5,)]
+    with pytest.raises(ValueError,match="do not fit") :
+        _export(str(path),["v"],fetched(rows))
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+def test_text_column_keeps_later_values_as_text(tmp_path) :
+    path = tmp_path / "m.parquet"
+    rows = [("a",)] * 70000 + [(1.5,),(None,),("b",)]
+    assert _export(str(path),["v"],fetched(rows))[0] == 70003
+    assert pq.read_table(str(path)).column("v").to_pylist()[-3:] == ["1.5",None,"b"]
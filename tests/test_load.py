@@ -0,0 +1,31 @@
+# -t CSV loading. run with: python -m pytest tests
+
+from xdb.xdb import _SqliteConnection, _load_tables
+
+CSV = """id,code,n,f,b
+1,,1,1,True
+2,,2,2,False
+3,,3,2.5,True
+4,01234,4,3,False
+5,ab,x,4,
+"""
+
+def load(tmp_path, chunksize) :
+    path = tmp_path / "t.csv"
+    path.write_text(CSV)
+    con = _SqliteConnection()
+    _load_tables(con,[("t",str(path),"replace")],chunksize=chunksize)
+    return con
+
+def test_types_do_not_depend_on_chunks(tmp_path) :
+    sql = "select id, code, typeof(code), n, typeof(n), f, typeof(f), b from t order by id"
+    whole = load(tmp_path,100000).execute(sql).fetchall()
+    chunked = load(tmp_path,3).execute(sql).fetchall()
+    assert chunked == whole
+
+def test_column_empty_in_first_chunk_keeps_text(tmp_path) :
+    con = load(tmp_path,3)
+    assert con.execute("select code, typeof(code) from t where id = 4").fetchall() == [("01234","text")]
+    assert con.execute("select n, typeof(n) from t where id = 1").fetchall() == [("1","text")]
+    assert con.execute("select f, typeof(f) from t where id = 3").fetchall() == [(2.5,"real")]
+    assert con.execute("select b from t order by id").fetchall() == [(1,),(0,),(1,),(0,),(None,)]
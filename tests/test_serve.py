@@ -0,0 +1,55 @@
+# xdb --serve / --client. run with: python -m pytest tests
+
+import socket
+import threading
+import time
+
+import pytest
+
+from xdb.xdb import _serve, _client
+
+@pytest.fixture
+def server(tmp_path, monkeypatch) :
+    (tmp_path / "t.csv").write_text("id,name\n1,a\n2,b\n3,c\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME",str(tmp_path / "cache"))
+    path = str(tmp_path / "xdb.sock")
+    thread = threading.Thread(target=_serve,args=(path,1,4),daemon=True)
+    thread.start()
+    for _ in range(100) :
+        probe = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+        try :
+            probe.connect(path)
+            break
+        except OSError :
+            time.sleep(0.05)
+        finally :
+            probe.close()
+    yield path
+    # the server exits after a second without requests
+    thread.join(10)
+    assert not thread.is_alive()
+
+def run(capfd, path, *argv) :
+    code = _client(path,list(argv)+["--cachedir","cache"])
+    out, err = capfd.readouterr()
+    return code, out, err
+
+def test_client_loads_tables_relative_to_its_directory(server, capfd) :
+    code, out, err = run(capfd,server,"-t","t.csv","-q","select count(*) as n from t","--csv")
+    assert code == 0, err
+    assert out.split() == ["n","3"]
+
+def test_warm_tables_are_reused_until_changed(server, capfd) :
+    sql = "select count(*) as n from t"
+    code, out, err = run(capfd,server,"-X","-t","t.csv","-q",sql,"--csv")
+    assert code == 0 and "already loaded" not in err
+    code, out, err = run(capfd,server,"-X","-t","t.csv","-q",sql,"--csv")
+    assert code == 0 and "already loaded" in err
+    assert out.split() == ["n","3"]
+    # a statement that changes the tables must not leak into the next request
+    code, out, err = run(capfd,server,"-X","-t","t.csv","-q","insert into t values (4,'d')")
+    assert code == 0, err
+    code, out, err = run(capfd,server,"-X","-t","t.csv","-q",sql,"--csv")
+    assert code == 0 and "already loaded" not in err
+    assert out.split() == ["n","3"]